@@ -13,16 +13,32 @@ import sys
 import re
 from urllib.parse import unquote
 
+# Precompiled URL patterns
+_RE_ANY_PLACE = re.compile(
+    r'!1s(?P<hex>0x[a-fA-F0-9]+:[a-fA-F0-9x]+)'              # data parameter (!1s{hex_id})
+    r'|/place/[^/]+/[^/]+/data=[^/]*place_id:(?P<pid>[^&]+)'  # newer URL format
+    r'|(?P<chij>ChIJ[a-zA-Z0-9_-]{22})'                       # standard Place ID (ChIJ...)
+)
+_RE_DETAILS = re.compile(r'/place/(?P<name>[^/@]+)|@(?P<lat>-?\d+\.\d+),(?P<lng>-?\d+\.\d+)')
+
 def extract_place_id_from_url(url):
     """Extract Place ID from various Google Maps URL formats"""
     
-    # Decode URL
-    url = unquote(url)
+    # Decode URL (only needed when it contains percent-escapes)
+    if '%' in url:
+        url = unquote(url)
+    
+    # Skip the regex entirely when none of the known markers are present
+    if not ('!1s' in url or 'place_id:' in url or 'ChIJ' in url):
+        return None
+    
+    # Single scan over the URL; the first format found wins
+    match = _RE_ANY_PLACE.search(url)
+    if not match:
+        return None
     
-    # Method 1: Look for place ID in data parameter (format: !1s{place_id})
-    match = re.search(r'!1s(0x[a-fA-F0-9]+:[a-fA-F0-9x]+)', url)
-    if match:
-        hex_id = match.group(1)
+    if match.lastgroup == 'hex':
+        hex_id = match.group('hex')
         print(f"Found hex Place ID: {hex_id}")
         
         # Note: Google's internal hex format needs to be converted to the standard format
@@ -35,33 +51,23 @@ def extract_place_id_from_url(url):
         print("5. The Place ID will be in the iframe src URL")
         return None
     
-    # Method 2: Look for place ID in newer URL format
-    match = re.search(r'/place/[^/]+/[^/]+/data=[^/]*place_id:([^&]+)', url)
-    if match:
-        return match.group(1)
-    
-    # Method 3: Look for standard Place ID format (ChIJ...)
-    match = re.search(r'(ChIJ[a-zA-Z0-9_-]{22})', url)
-    if match:
-        return match.group(1)
-    
-    return None
+    return match.group(match.lastgroup)
 
 def get_place_details_from_url(url):
     """Extract place name and coordinates from URL"""
     details = {}
     
-    # Extract place name
-    match = re.search(r'/place/([^/@]+)', url)
-    if match:
-        place_name = unquote(match.group(1).replace('+', ' '))
-        details['name'] = place_name
-    
-    # Extract coordinates
-    match = re.search(r'@(-?\d+\.\d+),(-?\d+\.\d+)', url)
-    if match:
-        details['latitude'] = float(match.group(1))
-        details['longitude'] = float(match.group(2))
+    # Extract place name and coordinates in a single scan, keeping the
+    # first occurrence of each
+    for match in _RE_DETAILS.finditer(url):
+        if match.group('name') is not None:
+            if 'name' not in details:
+                details['name'] = unquote(match.group('name').replace('+', ' '))
+        elif 'latitude' not in details:
+            details['latitude'] = float(match.group('lat'))
+            details['longitude'] = float(match.group('lng'))
+        if 'name' in details and 'latitude' in details:
+            break
     
     return details
 
@@ -10,14 +10,35 @@ This script is provided as an alternative method when the official tool isn't av
 """
 
 import sys
+import re
 import json
 import argparse
 import requests
 from urllib.parse import quote
 
+# Use orjson for faster response parsing when it is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# A query that is already a standard Place ID (ChIJ...)
+_RE_CHIJ_FULL = re.compile(r'^ChIJ[A-Za-z0-9_-]{22,}$')
+
 def search_place(query, api_key=None):
     """Search for a place and return potential matches with Place IDs"""
     
+    # Already a Place ID, no need to search for it
+    place_id = query.strip()
+    if _RE_CHIJ_FULL.match(place_id):
+        return [{
+            'name': place_id,
+            'address': '(provided)',
+            'place_id': place_id,
+            'types': []
+        }]
+    
     if not api_key:
         print("Note: For better results, you can use a Google Maps API key")
         print("Without an API key, using alternative method...\n")
@@ -50,7 +71,7 @@ def search_place(query, api_key=None):
     
     try:
         response = requests.post(base_url, headers=headers, json=data)
-        result = response.json()
+        result = _json_loads(response.content)
         
         if 'error' in result:
             print(f"Places API (New) Error: {result['error'].get('message', 'Unknown error')}")
@@ -66,7 +87,7 @@ def search_place(query, api_key=None):
             }
             
             response = requests.get(legacy_url, params=params)
-            data = response.json()
+            data = _json_loads(response.content)
             
             if data.get('status') != 'OK':
                 print(f"Error: {data.get('status')}")
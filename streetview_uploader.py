@@ -8,28 +8,67 @@ import os
 import sys
 import json
 import argparse
+import logging
 from pathlib import Path
-import mimetypes
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import requests
+# Google API client libraries are imported where they are used, so that
+# --help and argument errors don't pay for loading them
+
+try:
+    from PIL import Image
+    from PIL.ExifTags import TAGS
+    
+    _DATETIME_TAG_ID = next(k for k, v in TAGS.items() if v == "DateTime")
+    _GPSINFO_TAG_ID = next(k for k, v in TAGS.items() if v == "GPSInfo")
+except ImportError:
+    Image = None
+
+log = logging.getLogger(__name__)
 
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/streetviewpublish']
 
+# Headers sent with every raw photo upload (authorization is added by the session)
+UPLOAD_HEADERS = {
+    'Content-Type': 'image/jpeg',
+    'X-Goog-Upload-Protocol': 'raw'
+}
+
 class StreetViewUploader:
     def __init__(self, credentials_file='credentials.json', token_file='token.json'):
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.service = None
         self.creds = None
+        self._session = None
+        self._pool_size = 4
+        
+        # The discovery-based service is not thread-safe, so API calls on it are serialized
+        self._service_lock = threading.Lock()
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Closes the underlying HTTP session"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         
     def authenticate(self):
         """Handles OAuth2 authentication flow"""
+        from google.auth.transport.requests import AuthorizedSession, Request
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from googleapiclient.discovery import build
+        
         # Token file stores the user's access and refresh tokens
         if os.path.exists(self.token_file):
             self.creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
@@ -37,10 +76,10 @@ class StreetViewUploader:
         # If there are no (valid) credentials available, let the user log in
         if not self.creds or not self.creds.valid:
             if self.creds and self.creds.expired and self.creds.refresh_token:
-                print("Refreshing authentication token...")
+                log.info("Refreshing authentication token...")
                 self.creds.refresh(Request())
             else:
-                print("Starting authentication flow...")
+                log.info("Starting authentication flow...")
                 flow = InstalledAppFlow.from_client_secrets_file(
                     self.credentials_file, SCOPES)
                 self.creds = flow.run_local_server(port=0)
@@ -49,60 +88,78 @@ class StreetViewUploader:
             with open(self.token_file, 'w') as token:
                 token.write(self.creds.to_json())
                 
-        # Build the Street View Publish API service
-        self.service = build('streetviewpublish', 'v1', credentials=self.creds)
-        print("Authentication successful!")
+        # Authorized session refreshes the token when it expires and keeps
+        # connections alive across sequential uploads
+        self.close()
+        self._session = AuthorizedSession(self.creds)
+        self._mount_adapter()
+        
+        # Build the Street View Publish API service from the discovery document
+        # bundled with google-api-python-client instead of fetching it each run
+        self.service = build('streetviewpublish', 'v1', credentials=self.creds,
+                             static_discovery=True)
+        log.info("Authentication successful!")
+        
+    def _mount_adapter(self):
+        """Mounts a retrying adapter with room for one connection per upload worker"""
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        # Close the adapter being replaced so its pooled connections are released
+        previous = self._session.adapters.get('https://')
+        if previous is not None:
+            previous.close()
+        
+        retries = Retry(total=3, backoff_factor=0.5,
+                        status_forcelist=(429, 500, 502, 503, 504))
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=self._pool_size, max_retries=retries))
+        
+    def get_exif_data(self, image_path, include_gps=True):
+        """Extract GPS and datetime data from image EXIF
+        
+        With include_gps=False only the capture time is read and the GPS IFD
+        is not parsed.
+        """
+        if Image is None:
+            log.warning("Warning: Could not extract EXIF data: Pillow is not installed")
+            return {}
         
-    def get_exif_data(self, image_path):
-        """Extract GPS and datetime data from image EXIF"""
         try:
-            from PIL import Image
-            from PIL.ExifTags import TAGS, GPSTAGS
-            
             image = Image.open(image_path)
             exifdata = image.getexif()
             
             # Get capture time from EXIF
             capture_time = None
-            for tag_id, value in exifdata.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag == "DateTime":
-                    # Convert EXIF datetime to timestamp
-                    from datetime import datetime
-                    dt = datetime.strptime(value, "%Y:%m:%d %H:%M:%S")
-                    capture_time = int(dt.timestamp())
-                    break
+            value = exifdata.get(_DATETIME_TAG_ID)
+            if value:
+                # Convert EXIF datetime ("YYYY:MM:DD HH:MM:SS", local time) to timestamp
+                dt = datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                              int(value[11:13]), int(value[14:16]), int(value[17:19]))
+                capture_time = int(dt.timestamp())
+            
+            if not include_gps:
+                return {'capture_time': capture_time}
             
-            # Get GPS data
-            gps_data = {}
-            for tag_id, value in exifdata.items():
-                tag = TAGS.get(tag_id, tag_id)
-                if tag == "GPSInfo":
-                    for gps_tag_id, gps_value in value.items():
-                        gps_tag = GPSTAGS.get(gps_tag_id, gps_tag_id)
-                        gps_data[gps_tag] = gps_value
+            # Get GPS data, indexed by GPS tag ID (1-6: latitude, longitude and
+            # altitude, each as a reference/value pair)
+            gps_ifd = exifdata.get_ifd(_GPSINFO_TAG_ID)
+            lat_ref, lat, lon_ref, lon, alt_ref, alt = (gps_ifd.get(k) for k in (1, 2, 3, 4, 5, 6))
             
             # Convert GPS coordinates to decimal degrees
             latitude = None
             longitude = None
             altitude = None
             
-            if gps_data:
-                # Latitude
-                if 'GPSLatitude' in gps_data and 'GPSLatitudeRef' in gps_data:
-                    lat = gps_data['GPSLatitude']
-                    lat_ref = gps_data['GPSLatitudeRef']
-                    latitude = (lat[0] + lat[1]/60 + lat[2]/3600) * (-1 if lat_ref == 'S' else 1)
-                
-                # Longitude
-                if 'GPSLongitude' in gps_data and 'GPSLongitudeRef' in gps_data:
-                    lon = gps_data['GPSLongitude']
-                    lon_ref = gps_data['GPSLongitudeRef']
-                    longitude = (lon[0] + lon[1]/60 + lon[2]/3600) * (-1 if lon_ref == 'W' else 1)
-                
-                # Altitude
-                if 'GPSAltitude' in gps_data:
-                    altitude = float(gps_data['GPSAltitude'])
+            if lat is not None and lat_ref is not None:
+                latitude = (float(lat[0]) + float(lat[1])/60 + float(lat[2])/3600) * (-1 if lat_ref == 'S' else 1)
+            
+            if lon is not None and lon_ref is not None:
+                longitude = (float(lon[0]) + float(lon[1])/60 + float(lon[2])/3600) * (-1 if lon_ref == 'W' else 1)
+            
+            if alt is not None:
+                # Altitude reference 1 means below sea level
+                altitude = float(alt) * (-1 if alt_ref in (1, b'\x01') else 1)
             
             return {
                 'capture_time': capture_time,
@@ -112,25 +169,33 @@ class StreetViewUploader:
             }
             
         except Exception as e:
-            print(f"Warning: Could not extract EXIF data: {e}")
+            log.warning("Warning: Could not extract EXIF data: %s", e)
             return {}
     
     def upload_photo(self, image_path, latitude=None, longitude=None, altitude=None, 
                      heading=None, place_id=None):
         """Uploads a 360 photo to Google Street View with location data"""
-        # Validate file exists and is a JPG
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+        from googleapiclient.errors import HttpError
+        
+        # Validate file exists and is a JPG (a single stat provides size and mtime)
+        try:
+            stat_result = os.stat(image_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image file not found: {image_path}") from None
             
-        mime_type, _ = mimetypes.guess_type(image_path)
-        if mime_type not in ['image/jpeg', 'image/jpg']:
-            raise ValueError(f"File must be a JPEG image. Got: {mime_type}")
+        path_str = os.fspath(image_path)
+        if not path_str.lower().endswith(('.jpg', '.jpeg', '.jpe')):
+            raise ValueError(f"File must be a JPEG image. Got: {os.path.splitext(path_str)[1] or path_str}")
             
-        file_size = os.path.getsize(image_path)
-        print(f"Uploading image: {image_path} ({file_size:,} bytes)")
+        if stat_result.st_size == 0:
+            raise ValueError(f"Image file is empty: {image_path}")
+            
+        file_size = stat_result.st_size
+        log.info("Uploading image: %s (%d bytes)", image_path, file_size)
         
-        # Extract EXIF data
-        exif_data = self.get_exif_data(image_path)
+        # Extract EXIF data; the GPS block is skipped when every location value was provided
+        need_gps = latitude is None or longitude is None or altitude is None
+        exif_data = self.get_exif_data(image_path, include_gps=need_gps)
         
         # Use provided coordinates or fall back to EXIF
         if latitude is None:
@@ -140,33 +205,34 @@ class StreetViewUploader:
         if altitude is None:
             altitude = exif_data.get('altitude')
             
-        capture_time = exif_data.get('capture_time', int(os.path.getmtime(image_path)))
+        capture_time = exif_data.get('capture_time') or int(stat_result.st_mtime)
         
         try:
             # Step 1: Start upload to get an upload URL
-            print("Requesting upload URL...")
-            upload_ref = self.service.photo().startUpload(body={}).execute()
+            log.info("%s: Requesting upload URL...", image_path)
+            with self._service_lock:
+                upload_ref = self.service.photo().startUpload(body={}).execute()
             upload_url = upload_ref['uploadUrl']
             
             # Step 2: Upload the photo bytes to the upload URL
-            print("Uploading image data...")
-            with open(image_path, 'rb') as photo_file:
-                photo_bytes = photo_file.read()
-                
+            log.info("%s: Uploading image data...", image_path)
             headers = {
-                'Authorization': f'Bearer {self.creds.token}',
-                'Content-Type': 'image/jpeg',
-                'X-Goog-Upload-Protocol': 'raw',
-                'X-Goog-Upload-Content-Length': str(len(photo_bytes))
+                **UPLOAD_HEADERS,
+                'X-Goog-Upload-Content-Length': str(file_size)
             }
             
-            response = requests.post(upload_url, data=photo_bytes, headers=headers)
+            # Memory-map the image so its pages go straight from the OS cache to
+            # the socket without being copied into a Python bytes object
+            with open(image_path, 'rb') as photo_file, \
+                    mmap.mmap(photo_file.fileno(), 0, access=mmap.ACCESS_READ) as photo_map, \
+                    memoryview(photo_map) as photo_data:
+                response = self._session.post(upload_url, data=photo_data, headers=headers)
             
             if response.status_code != 200:
                 raise Exception(f"Upload failed with status {response.status_code}: {response.text}")
                 
             # Step 3: Create the photo with metadata
-            print("Creating photo entry...")
+            log.info("%s: Creating photo entry...", image_path)
             photo_body = {
                 'uploadReference': {
                     'uploadUrl': upload_url
@@ -176,6 +242,9 @@ class StreetViewUploader:
                 }
             }
             
+            # Summary lines are logged as one record so concurrent uploads don't interleave them
+            summary = []
+            
             # Add pose (location) data if available
             if latitude is not None and longitude is not None:
                 pose = {
@@ -190,34 +259,78 @@ class StreetViewUploader:
                     pose['heading'] = heading
                     
                 photo_body['pose'] = pose
-                print(f"  Location: {latitude:.6f}, {longitude:.6f}")
+                summary.append(f"  Location: {latitude:.6f}, {longitude:.6f}")
                 if altitude:
-                    print(f"  Altitude: {altitude:.1f}m")
+                    summary.append(f"  Altitude: {altitude:.1f}m")
                 if heading:
-                    print(f"  Heading: {heading:.1f}°")
+                    summary.append(f"  Heading: {heading:.1f}°")
             
             # Add place association if provided
             if place_id:
                 photo_body['places'] = [{
                     'placeId': place_id
                 }]
-                print(f"  Place ID: {place_id}")
+                summary.append(f"  Place ID: {place_id}")
             
-            created_photo = self.service.photo().create(body=photo_body).execute()
+            with self._service_lock:
+                created_photo = self.service.photo().create(body=photo_body).execute()
             
-            print(f"✓ Photo uploaded successfully!")
-            print(f"  Photo ID: {created_photo.get('photoId', {}).get('id', 'N/A')}")
-            print(f"  Share link: {created_photo.get('shareLink', 'N/A')}")
-            print(f"  View count: {created_photo.get('viewCount', 0)}")
+            summary.append(f"  Photo ID: {created_photo.get('photoId', {}).get('id', 'N/A')}")
+            summary.append(f"  Share link: {created_photo.get('shareLink', 'N/A')}")
+            summary.append(f"  View count: {created_photo.get('viewCount', 0)}")
+            log.info("✓ %s uploaded successfully!\n%s", image_path, "\n".join(summary))
             
             return created_photo
             
         except HttpError as error:
-            print(f"✗ An HTTP error occurred: {error}")
+            log.error("✗ %s: An HTTP error occurred: %s", image_path, error)
             raise
         except Exception as error:
-            print(f"✗ An error occurred: {error}")
+            log.error("✗ %s: An error occurred: %s", image_path, error)
             raise
+    
+    def upload_photos(self, image_paths, max_workers=4, **kwargs):
+        """Uploads several 360 photos concurrently
+        
+        Extra keyword arguments are passed to upload_photo for every image.
+        Returns one result dict per image, in the same order as image_paths,
+        with either the created photo or the error raised for that image.
+        """
+        # Materialize the paths so one-shot iterables can be submitted and reported
+        image_paths = list(image_paths)
+        
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        
+        # Keep one pooled connection per worker so keep-alive isn't lost
+        if max_workers > self._pool_size:
+            self._pool_size = max_workers
+            if self._session is not None:
+                self._mount_adapter()
+        
+        if self.service is None:
+            self.authenticate()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.upload_photo, image_path, **kwargs)
+                       for image_path in image_paths]
+        
+        results = []
+        for image_path, future in zip(image_paths, futures):
+            error = future.exception()
+            results.append({
+                'image': image_path,
+                'photo': None if error else future.result(),
+                'error': error
+            })
+        return results
+
+def positive_int(value):
+    """argparse type for integers greater than zero"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 def main():
     parser = argparse.ArgumentParser(
@@ -239,8 +352,13 @@ Examples:
   
   # Upload with Google Place ID
   %(prog)s image.jpg --place-id ChIJIQBpAG2ahYAR_6128GcTUEo
+  
+  # Upload several images concurrently (each uses its own EXIF GPS;
+  # --lat/--lng/--alt/--heading are only accepted for a single image)
+  %(prog)s pano1.jpg pano2.jpg pano3.jpg --workers 4
         ''')
-    parser.add_argument('image', help='Path to the JPG image to upload')
+    parser.add_argument('images', nargs='+', metavar='image',
+                        help='Path to the JPG image(s) to upload')
     parser.add_argument('--credentials', default='credentials.json',
                         help='Path to credentials.json file (default: credentials.json)')
     parser.add_argument('--token', default='token.json',
@@ -255,13 +373,24 @@ Examples:
                         help='Compass heading in degrees (0-360, 0=North)')
     parser.add_argument('--place-id', dest='place_id',
                         help='Google Place ID to associate with the photo')
+    parser.add_argument('--workers', type=positive_int, default=4,
+                        help='Number of concurrent uploads when several images are given (default: 4)')
     
     args = parser.parse_args()
     
+    # Show the uploader's progress messages on stdout
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+    
     # Validate coordinate pairs
     if (args.latitude is None) != (args.longitude is None):
         parser.error("Both --lat and --lng must be provided together")
     
+    # Location options describe a single photo, so don't apply them to a batch
+    if len(args.images) > 1 and any(value is not None for value in (
+            args.latitude, args.longitude, args.altitude, args.heading)):
+        parser.error("--lat, --lng, --alt and --heading can only be used with a single image; "
+                     "batch uploads take each image's location from its EXIF GPS data")
+    
     # Initialize uploader
     uploader = StreetViewUploader(
         credentials_file=args.credentials,
@@ -272,17 +401,29 @@ Examples:
         # Authenticate
         uploader.authenticate()
         
-        # Upload the photo
-        result = uploader.upload_photo(
-            args.image,
-            latitude=args.latitude,
-            longitude=args.longitude,
-            altitude=args.altitude,
-            heading=args.heading,
-            place_id=args.place_id
-        )
-        
-        print("\n✓ Upload completed successfully!")
+        if len(args.images) == 1:
+            # Upload the photo
+            result = uploader.upload_photo(
+                args.images[0],
+                latitude=args.latitude,
+                longitude=args.longitude,
+                altitude=args.altitude,
+                heading=args.heading,
+                place_id=args.place_id
+            )
+            
+            print("\n✓ Upload completed successfully!")
+        else:
+            # Upload all photos concurrently
+            results = uploader.upload_photos(args.images, max_workers=args.workers,
+                                             place_id=args.place_id)
+            failed = [r for r in results if r['error']]
+            
+            print(f"\n{len(results) - len(failed)} of {len(results)} uploads completed successfully")
+            for r in failed:
+                print(f"✗ {r['image']}: {r['error']}")
+            if failed:
+                sys.exit(1)
         
     except FileNotFoundError as e:
         print(f"\n✗ Error: {e}")
@@ -293,6 +434,8 @@ Examples:
     except Exception as e:
         print(f"\n✗ Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        uploader.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file